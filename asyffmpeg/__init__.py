@@ -1,14 +1,65 @@
 import asyncio
-from datetime import timedelta, datetime
+from collections import OrderedDict
+from datetime import timedelta
 import logging
 import os
+import time
 from .statistic import Statistics
-import aiofiles
-from typing import Awaitable, Callable, Dict, List, Literal, Union
-from .tempf import TempFile
-from ffprobe import FFProbe
+from typing import Awaitable, Callable, Dict, List, Literal, Optional, Tuple
+
+
+_PROBE_CACHE_SIZE = 128
+_probe_cache: "OrderedDict[Tuple[str, int, int], Tuple[float, float]]" = OrderedDict()
+
+
+async def _probe_cached(path: str) -> Tuple[float, float]:
+    """
+    Probes a media file for its frame rate and duration.
+
+    ffprobe is queried only for the first video stream's `r_frame_rate` and the container duration,
+    printed as two bare CSV lines.
+    Results are kept in an LRU cache keyed by the path, size and modification time of the file,
+    so a changed file is probed again.
+
+    Args:
+        path (`str`): The path to the media file.
+
+    Returns:
+        `Tuple[float, float]`: The frame rate and the duration in seconds.
+    """
+    stat = os.stat(path)
+    key = (path, stat.st_size, stat.st_mtime_ns)
+    if key in _probe_cache:
+        _probe_cache.move_to_end(key)
+        return _probe_cache[key]
+
+    proc = await asyncio.create_subprocess_exec(
+        'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+        '-show_entries', 'stream=r_frame_rate:format=duration', '-of', 'csv=p=0', path,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL
+    )
+    stdout, _ = await proc.communicate()
+
+    # Streams with side data (e.g. a display matrix) get extra CSV fields, so only the first one is used
+    lines = [line.split(',', 1)[0].strip() for line in stdout.decode(errors='ignore').splitlines()]
+    lines = [line for line in lines if line]
+    if len(lines) < 2:
+        raise ValueError(f"Unexpected ffprobe output: {stdout!r}")
+
+    numerator, _, denominator = lines[0].partition('/')
+    try:
+        framerate = float(numerator) / float(denominator or 1)
+        duration = float(lines[-1])
+    except ValueError:
+        raise ValueError(f"Unexpected ffprobe output: {stdout!r}")
+
+    _probe_cache[key] = (framerate, duration)
+    if len(_probe_cache) > _PROBE_CACHE_SIZE:
+        _probe_cache.popitem(last=False)
+
+    return framerate, duration
 
-from .util import convert_to_seconds
 
 class AsyFFmpeg:
     """
@@ -34,24 +85,38 @@ class AsyFFmpeg:
         asyncio.run(main())
         ```
     """
-    def __init__(self, debug:bool=False, logger:logging.Logger=None) -> None:
+    def __init__(self, debug:bool=False, logger:logging.Logger=None, progress_interval:float=0.25,
+                 capture_stderr:bool=False) -> None:
         """
         Initializes an instance of the AsyFFmpeg class.
 
         Args:
             debug (`bool, optional`): Whether debugging is enabled. Defaults to False.
             logger (`logging.Logger, optional`): The logger object for logging debug messages. Defaults to None.
+            progress_interval (`float, optional`): The minimum number of seconds between two `progress` events.
+                The final event is always emitted. Defaults to 0.25.
+            capture_stderr (`bool, optional`): Whether to capture FFmpeg's stderr and log it as debug output
+                when FFmpeg exits with a non-zero code. Otherwise it is discarded. Defaults to False.
         """
         self.__logger = logger
         self.__debug = debug
+        self.__capture_stderr = capture_stderr
+        self.progress_interval = progress_interval
 
         self._input = ""
         self._output = ""
-        self._args: Dict[str, str] = {}
+        self._args: Dict[str, Optional[str]] = {}
+        self._cmd: List[str] = []
+
+        self.file_framerate: Optional[float] = None
+        self.file_duration: Optional[float] = None
+        self._media_info_set = False
+        self._probe_done: Optional[asyncio.Event] = None
 
         self.__events:Dict[str, Callable[[None], Awaitable[None]]] = {}
 
-        self.__start_time:datetime = 0
+        self.__start_time:float = 0.0
+        self.__last_emit:float = 0.0
 
         self.__preffix = "AsyFFmpeg"
 
@@ -82,25 +147,22 @@ class AsyFFmpeg:
         Builds the FFmpeg command based on input parameters.
 
         This method constructs the FFmpeg command by assembling the input file, output file, 
-        and additional arguments into a list of command-line arguments. If additional arguments 
-        are provided, they are included in the command along with their corresponding values.
+        and additional arguments into a fresh list of command-line arguments stored in `self._cmd`.
+        If additional arguments are provided, they are included in the command along with their corresponding values.
         If the value for an argument is `None`, only the key will be included in the command.
+        The arguments dictionary itself is left untouched, so the instance can be run again.
 
         Returns:
             `None`
         """
+        parts = ['-y', '-i', self._input]
+        for key, value in self._args.items():
+            parts.append('-' + key)
+            if value is not None:
+                parts.append(str(value))
 
-        args = ['-y', '-i', self._input if self._input.strip().find(" ") == -1 else f'"{self._input}"']
-
-        if self._args:
-            for key, value in self._args.items():
-                if value is not None:
-                    args.extend(['-' + key, value])
-                else:
-                    args.append('-' + key)
-
-        args.append(self._output)
-        self._args = args
+        parts.append(self._output)
+        self._cmd = parts
 
     def add_arg(self, arg_key: str, arg_value: str = None) -> None:
         """
@@ -130,6 +192,9 @@ class AsyFFmpeg:
             `None`
         """
         self._input = path
+        self.file_framerate = None
+        self.file_duration = None
+        self._media_info_set = False
 
     def output(self, path: str) -> None:
         """
@@ -145,7 +210,7 @@ class AsyFFmpeg:
         """
         self._output = path
 
-    def args(self, args: Dict[str, Union[str, None]] = {}) -> None:
+    def args(self, args: Optional[Dict[str, Optional[str]]] = None) -> None:
         """
         Sets additional arguments for FFmpeg.
 
@@ -153,86 +218,125 @@ class AsyFFmpeg:
         If the value for an argument key is `None`, only the key will be included in the command.
 
         Args:
-            args (`Dict[str, Union[str, None]], optional`): A dictionary containing additional arguments and their values.
+            args (`Dict[str, Optional[str]], optional`): A dictionary containing additional arguments and their values.
                 If a value is `None`, only the key will be included in the command.
 
         Returns:
             `None`
         """
-        self._args = {key: value.strip().replace(" ", "") if isinstance(value, str) else value for key, value in args.items()}
+        self._args = {key: value.strip().replace(" ", "") if isinstance(value, str) else value for key, value in (args or {}).items()}
+
+    def set_media_info(self, framerate: float, duration: float) -> None:
+        """
+        Sets the frame rate and duration of the input file.
+
+        When both values are known in advance, `run` uses them instead of probing the input with ffprobe
+        until `input` is called again. Runs without `set_media_info` always probe the input, using the cache.
+
+        Args:
+            framerate (`float`): The frame rate of the input video.
+            duration (`float`): The duration of the input video in seconds.
 
-    async def read_progress(self, progress_file_path: str) -> None:
+        Returns:
+            `None`
         """
-        Reads progress information from a file and triggers events accordingly.
+        self.file_framerate = framerate
+        self.file_duration = duration
+        self._media_info_set = True
 
-        This method continuously reads progress information from the specified file path,
-        parsing the lines and extracting relevant data. It calculates the progress of encoding
-        based on the number of frames processed, the frame rate, and the duration of the input video.
-        Then, it triggers the 'progress' event with details such as progress percentage, elapsed time,
-        remaining time, current frame, encoding status, and bitrate.
+    async def read_progress(self, stream: asyncio.StreamReader) -> None:
+        """
+        Reads progress information from the FFmpeg stdout stream and triggers events accordingly.
+
+        This method consumes the `-progress pipe:1` output of FFmpeg line by line as it arrives,
+        collecting the `key=value` pairs of each progress block until the terminating `progress=` line.
+        It calculates the progress of encoding based on the number of frames processed, the frame rate,
+        and the duration of the input video. Then, it triggers the 'progress' event with details such as
+        progress percentage, elapsed time, remaining time, current frame, encoding status, and bitrate.
+        If the input is still being probed, the method waits for the result before processing any progress.
+        When probing failed, the stream is only drained and no events are triggered.
+        The `end` event is not triggered here; `run` triggers it once FFmpeg has exited.
+        Exceptions raised by the `progress` callback propagate immediately and stop reading the stream.
 
         Args:
-            progress_file_path (`str`): The file path to read progress information from.
+            stream (`asyncio.StreamReader`): The stdout stream of the FFmpeg process.
 
         Returns:
             `None`
         """
+        if self._probe_done is not None:
+            await self._probe_done.wait()
+
+        progress_cb = self.__events.get('progress') if self.file_duration != -1 else None
+        interval = self.progress_interval
+        fps = self.file_framerate or 0
+        duration = self.file_duration or 0
+        total_frames = fps * duration if fps > 0 and duration > 0 else 0
+        start_time = self.__start_time
+
+        block = {}
         while True:
-            async with aiofiles.open(progress_file_path, mode='r') as progress_file:
-                lines = []
+            try:
+                line = await stream.readline()
+            except ValueError as e:
+                # The reader drops an over-long line, so carry on with the next one
+                self._debug(f"Failed to read progress: {e!r}")
+                block = {}
+                continue
+            if not line:
+                break
+
+            key, _, value = line.decode(errors='ignore').rstrip().partition('=')
+            if not value:
+                continue
+
+            block[key] = value
+            if key != 'progress':
+                continue
+
+            try:
+                progress = Statistics._from_mapping(block)
+            except ValueError as e:
+                self._debug(f"Failed to parse progress: {e!r}")
                 progress = None
-                async for line in progress_file:
-                    lines.append(line.strip())
-                    if len(lines) >= 12:
-                        progress = Statistics.from_line(' '.join(lines))
-                        lines = []  
-                if lines:
-                    progress = Statistics.from_line(' '.join(lines))
-                
-                if progress and self.__events.get('progress', None):
-                    _progress:float = round(progress.frame / (self.file_framerate * self.file_duration), 2) 
-                    elapsed_time = datetime.now() - self.__start_time
-                    if _progress > 0 and _progress < 1:
-                        remaining_time = timedelta(seconds=(elapsed_time.total_seconds() / _progress)) - elapsed_time
-                    else:
-                        remaining_time = timedelta()
-                       
-
-                    self._debug("Progress intercepted...")
-                    await self.__events['progress'](_progress, elapsed_time, remaining_time, 
-                                            progress.frame, not progress.progress, progress.bitrate)
-
-                    if progress.progress is False:
-                        self._debug("Encoding completed...")
-                        if self.__events.get('end', None):
-                            await self.__events['end'](datetime.now() - self.__start_time)
-
-                        await progress_file.close()
-                        break
-            await asyncio.sleep(1)
+            block = {}
+
+            if not progress or not progress_cb:
+                continue
+
+            now = time.monotonic()
+            if progress.progress is False or now - self.__last_emit >= interval:
+                self.__last_emit = now
+                _progress:float = round(progress.frame / total_frames, 2) if total_frames > 0 else 0.0
+                elapsed = now - start_time
+                remaining = elapsed / _progress - elapsed if 0 < _progress < 1 else 0.0
+
+                self._debug("Progress intercepted...")
+                await progress_cb(_progress, timedelta(seconds=elapsed), timedelta(seconds=remaining),
+                                  progress.frame, not progress.progress, progress.bitrate)
+
+            if progress.progress is False:
+                self._debug("Encoding completed...")
 
     async def _prepare(self) -> None:
         """
         Prepares necessary information before encoding.
 
         This method extracts essential information about the input video, such as frame rate and duration,
-        using FFProbe utility.
+        using ffprobe. Results are cached per file, so repeated runs on an unchanged input skip probing.
 
         Returns:
             `None`
         """
         try:
-            ffprobe = FFProbe(self._input)
-            self.file_framerate = ffprobe.streams[0].framerate
-            self.file_duration = convert_to_seconds(ffprobe.metadata['Duration'])
-            
-            del ffprobe
-
-
-        except (OSError, IndexError):
-            self._debug("Кreading progress is not possible ")
+            self.file_framerate, self.file_duration = await _probe_cached(self._input)
+        except (OSError, ValueError, ZeroDivisionError) as e:
+            self._debug(f"Кreading progress is not possible: {e!r}")
             self.file_framerate = -1
             self.file_duration = -1
+        finally:
+            if self._probe_done is not None:
+                self._probe_done.set()
 
         
         
@@ -266,54 +370,58 @@ class AsyFFmpeg:
         """
         Executes the FFmpeg command asynchronously.
 
-        This method prepares necessary information before encoding, builds the FFmpeg command,
-        and starts the encoding process asynchronously. It triggers the `start` event if registered,
-        indicating the start of encoding. Progress information is read from a temporary progress file,
-        and `progress` events are triggered accordingly. Finally, upon completion of encoding,
+        This method builds the FFmpeg command and starts the encoding process asynchronously,
+        probing the input concurrently (unless its information was provided with `set_media_info`).
+        It triggers the `start` event if registered, indicating the start of encoding.
+        Progress information is streamed from the FFmpeg stdout pipe, and `progress` events are triggered accordingly. Finally, upon completion of encoding,
         the `end` event is triggered if registered.
+        If `run` is cancelled or a `progress` callback raises, the FFmpeg process is killed
+        before the exception propagates.
 
         Returns:
             `None`
         """
-        await self._prepare()
-
         self.__build_command()
-        self.__start_time = datetime.now()
-        async with TempFile() as progress_file_path:
-            
-            self._debug("Encoding started...")
-            async def _run(args_list, f_path):
-                if self.__events.get('start', None):
-                    await self.__events['start'](self._input, self._output)
-
-                cmd = ["ffmpeg"] + [str(var) for var in args_list]
-                if self.file_duration != -1:
-                    cmd +=  ["-progress", f_path]
-                
-                proc = await asyncio.create_subprocess_exec(
-                    *cmd,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                stdout, stderr = await proc.communicate()
-                # print(stdout.decode())
-                # stderr.decode()
-                
-                
-
-                if proc.returncode != 0:
-                    self._debug(f"FFmpeg process exited with non-zero code: {proc.returncode}")
-
-                if self.__events.get('end', None):
-                    await self.__events['end'](datetime.now() - self.__start_time)
-                
-                return stdout, stderr
-
-            
-            tasks = []
-            tasks.append(asyncio.create_task(_run(self._args, str(progress_file_path))))
-            if self.file_duration != -1:
-                tasks.append(asyncio.create_task(self.read_progress(str(progress_file_path))))
-            await asyncio.gather(*tasks)
+        self.__start_time = time.monotonic()
+        self.__last_emit = 0.0
+
+        self._debug("Encoding started...")
+        if self.__events.get('start', None):
+            await self.__events['start'](self._input, self._output)
+
+        proc = await asyncio.create_subprocess_exec(
+            "ffmpeg", "-progress", "pipe:1", "-nostats", *self._cmd,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE if self.__capture_stderr else asyncio.subprocess.DEVNULL
+        )
+
+        # FFmpeg does not need the probe result, only the progress reader does
+        self._probe_done = asyncio.Event()
+        stderr_task = asyncio.create_task(proc.stderr.read()) if self.__capture_stderr else None
+        tasks = [self.read_progress(proc.stdout)]
+        if not self._media_info_set:
+            tasks.append(self._prepare())
+        else:
+            self._probe_done.set()
 
-    
\ No newline at end of file
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            # Nothing reads stdout anymore, so FFmpeg would eventually block on a full pipe
+            if proc.returncode is None:
+                proc.kill()
+            await proc.wait()
+            if stderr_task:
+                stderr_task.cancel()
+            raise
+
+        await proc.wait()
+        stderr = await stderr_task if stderr_task else b''
+
+        if proc.returncode != 0:
+            self._debug(f"FFmpeg process exited with non-zero code: {proc.returncode}")
+            if stderr:
+                self._debug(stderr.decode(errors='ignore'))
+
+        if self.__events.get('end', None):
+            await self.__events['end'](timedelta(seconds=time.monotonic() - self.__start_time))
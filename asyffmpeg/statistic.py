@@ -1,11 +1,7 @@
-from dataclasses import dataclass, field
 from datetime import timedelta
-import re
-from typing import Optional
+from typing import Dict, NamedTuple, Optional
 from .util import parse_size, parse_time
 
-_pattern = re.compile(r"(frame|fps|size|time|bitrate|speed|progress)\s*=\s*(\S+)")
-
 _field_factory = {
     "frame": int,
     "fps": float,
@@ -16,21 +12,58 @@ _field_factory = {
     "progress": lambda item: True if item == "continue" else False,
 }
 
-@dataclass(frozen=True)
-class Statistics:
+class Statistics(NamedTuple):
     frame: int = 0
     fps: float = 0.0
     size: int = 0
-    time: timedelta = field(default_factory=timedelta)
+    time: timedelta = timedelta()
     bitrate: float = 0.0
     speed: float = 0.0
     progress: bool = False
 
     @classmethod
     def from_line(cls, line: str) -> Optional['Statistics']:
-        statistics = {key: value for key, value in _pattern.findall(line)}
-        if len(statistics) < 4:
+        # Accepts both newline separated `-progress` blocks and whitespace separated
+        # stats lines such as `frame=  100 fps= 25 size=  256kB ...`
+        mapping = {}
+        key = None
+        for token in line.replace("=", "= ").split():
+            if token.endswith("="):
+                key = token[:-1]
+            elif key is not None:
+                mapping[key] = token
+                key = None
+
+        try:
+            return cls._from_mapping(mapping)
+        except ValueError:
+            return None
+
+    @classmethod
+    def _from_mapping(cls, mapping: Dict[str, str]) -> Optional['Statistics']:
+        fields = {}
+        for key, value in mapping.items():
+            value = value.strip()
+            if not value or value == "N/A":
+                continue
+
+            if key == "frame":
+                fields["frame"] = int(value)
+            elif key == "fps":
+                fields["fps"] = float(value)
+            elif key == "progress":
+                fields["progress"] = value == "continue"
+            elif key == "bitrate" or key == "speed":
+                fields[key] = _field_factory[key](value)
+            elif key == "out_time" or key == "time":
+                fields["time"] = _field_factory["time"](value)
+            elif key == "total_size":
+                # `-progress` reports the total size in bytes already
+                fields["size"] = int(value)
+            elif key == "size":
+                fields["size"] = _field_factory["size"](value)
+
+        if "frame" not in fields:
             return None
 
-        fields = {key: _field_factory[key](value) for key, value in statistics.items() if value != "N/A"}
-        return cls(**fields)
\ No newline at end of file
+        return cls(**fields)
@@ -1,7 +1,6 @@
-import re
 from datetime import timedelta
 
-def convert_to_seconds(time_str) -> int:
+def convert_to_seconds(time_str) -> float:
     """
     Converts a time string to seconds.
 
@@ -11,14 +10,13 @@ def convert_to_seconds(time_str) -> int:
         time_str (`str`): A time string in the format "hours:minutes:seconds.milliseconds".
 
     Returns:
-        `int`: The time converted to seconds.
+        `float`: The time converted to seconds.
     """
-    match = re.match(r'(\d+):(\d+):(\d+\.\d+)', time_str)
-    if match:
-        hours, minutes, seconds = map(float, match.groups())
-        return hours * 3600 + minutes * 60 + seconds
-
-    return 0
+    try:
+        hours, minutes, seconds = time_str.split(':')
+        return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except ValueError:
+        return 0
 
 def parse_time(time: str) -> timedelta:
     """
@@ -33,14 +31,20 @@ def parse_time(time: str) -> timedelta:
     Returns:
         `timedelta`: A timedelta object representing the parsed time.
     """
-    match = re.search(r"(-?\d+):(\d+):(\d+)\.(\d+)", time)
-    assert match is not None
+    sign = 1
+    if time.startswith('-'):
+        sign = -1
+        time = time[1:]
+
+    hours, minutes, rest = time.split(':', 2)
+    seconds, _, fraction = rest.partition('.')
 
-    return timedelta(
-        hours=int(match.group(1)),
-        minutes=int(match.group(2)),
-        seconds=int(match.group(3)),
-        milliseconds=int(match.group(4)) * 10,
+    # The fraction is centiseconds in stats lines and microseconds in `-progress` output
+    return sign * timedelta(
+        hours=int(hours),
+        minutes=int(minutes),
+        seconds=int(seconds),
+        microseconds=int(fraction[:6].ljust(6, '0')) if fraction else 0,
     )
 
 # https://github.com/FFmpeg/FFmpeg/blob/d38bf5e08e768722096723b5c8781cd2eb18d070/fftools/ffmpeg.c#L618C53-L618C56
@@ -57,10 +61,10 @@ def parse_size(item: str) -> int:
     Returns:
         `int`: The size in bytes.
     """
-    if "kB" in item:
-        return int(item.replace("kB", "")) * 1024
-    elif "KiB" in item:
-        return int(item.replace("KiB", "")) * 1024
+    if item.endswith("kB"):
+        return int(item[:-2]) * 1024
+    elif item.endswith("KiB"):
+        return int(item[:-3]) * 1024
     else:
         return int(item) * 1024
         # raise ValueError(f"Unknown size format: {item}")
\ No newline at end of file
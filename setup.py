@@ -4,10 +4,7 @@ setup(
     name='asyffmpeg',
     version='0.2.3',
     packages=find_packages(),
-    install_requires=[
-        'aiofiles',
-        'ffprobe-python',
-    ],
+    install_requires=[],
     author='drhspfn',
     author_email='jenya.gsta@gmail.com',
     description='A library for asynchronous operation with FFmpeg, providing the ability to track events such as start, end, and encoding progress.',